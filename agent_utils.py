@@ -0,0 +1,74 @@
+# Shared streaming/print helpers for the agent scripts
+# print_stream_chunk used to be copy-pasted verbatim across the agent files;
+# keeping one copy here means every optimization to it (handler table,
+# pre-bound stdout write) applies uniformly, and CPython's per-code-object
+# inline caches specialize a single function instead of three clones.
+
+import sys
+
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+
+TRUNCATE_LEN = 500
+
+# Pre-bound write: skips print()'s argument formatting and separator/newline
+# handling on every call, which adds up under token-by-token streaming
+_stdout_write = sys.stdout.write
+
+
+def chunk_text(content):
+    """Extract plain text from a streamed message chunk (Anthropic may send content blocks)"""
+    if isinstance(content, str):
+        return content
+    # List of content blocks: keep only the text pieces
+    return "".join(
+        block.get("text", "") for block in content if isinstance(block, dict)
+    )
+
+
+# Handlers are dispatched on type(msg) through a precomputed table: one
+# C-level dict lookup per chunk instead of chained hasattr/isinstance
+# probes, which matters once chunks arrive at token granularity.
+def _print_ai(msg, step_num):
+    # Branch once on tool_calls truthiness
+    tool_calls = getattr(msg, 'tool_calls', None)
+
+    # Tool call decision (LLM wants to use a tool)
+    if tool_calls:
+        _stdout_write(f"\n[Step {step_num}] 🤖 Agent decided to call tool:\n")
+        for tool_call in tool_calls:
+            _stdout_write(f"   🔧 {tool_call['name']}({tool_call['args']})\n")
+
+    # Final assistant response
+    elif msg.content:
+        _stdout_write(f"\n[Step {step_num}] ✅ FINAL ANSWER:\n")
+        _stdout_write(f"\n🤖 {msg.content}\n")
+
+
+def _print_tool(msg, step_num):
+    # Tool response (results from Tavily), truncated for readability
+    _stdout_write(f"\n[Step {step_num}] 🔍 Tool response received:\n")
+    content = msg.content
+    _stdout_write(
+        f"   💡 {content[:TRUNCATE_LEN]}...\n" if len(content) > TRUNCATE_LEN
+        else f"   💡 {content}\n"
+    )
+
+
+def _noop(msg, step_num):
+    pass
+
+
+_HANDLERS = {AIMessage: _print_ai, ToolMessage: _print_tool, HumanMessage: _noop}
+
+
+def print_stream_chunk(chunk, step_num):
+    """Print different message types during streaming"""
+    if "messages" not in chunk:
+        return
+
+    new_messages = chunk["messages"]
+    if not new_messages:
+        return
+
+    msg = new_messages[-1]
+    _HANDLERS.get(type(msg), _noop)(msg, step_num)
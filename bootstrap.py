@@ -0,0 +1,424 @@
+# Shared lazy bootstrap for the agent scripts
+# All three entry scripts used to call load_dotenv(), validate API keys and
+# construct an identical ChatAnthropic client at import time, so importing any
+# of them (tests, Lambda, abatch callers) repeated the same startup work.
+# Everything here is memoized with functools.cache: the first caller pays,
+# every later caller (same or different module) gets the cached object.
+
+import functools
+import inspect
+import os
+import uuid
+
+from dotenv import load_dotenv
+from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware, AgentState, ModelRequest
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.store.base import BaseStore
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import time
+
+from llm_cache import CachedChatAnthropic
+from tools import TOOLS
+
+# AgentCore memory resource shared by the memory-enabled agent
+MEMORY_ID = "memory_for_lagchain_agent-ZgBqYyGADI"
+
+# Tag attached to the internal history-summarization call so stream
+# consumers can tell its tokens apart from the real answer (it runs inside
+# the model node, so it otherwise looks identical in stream_mode="messages")
+SUMMARIZER_TAG = "history-summarizer"
+
+FAQ_SYSTEM_PROMPT = """You are a helpful FAQ assistant with access to a knowledge base and user memory.
+
+Your goal is to answer user questions accurately using the available tools while remembering user preferences.
+
+Guidelines:
+1. Check if you have relevant user preferences or history from previous conversations
+2. Use the tools to find relevant information from the knowledge base
+3. If the query is complex, use reformulate_query to search different aspects
+4. Personalize responses based on user preferences when relevant
+5. Always provide a clear, concise answer based on the retrieved information
+6. If you cannot find relevant information, clearly state that
+
+Think step-by-step and use tools strategically to provide the best answer."""
+
+
+@functools.cache
+def load_environment():
+    """Parse .env and validate API keys, once per process."""
+    load_dotenv()
+
+    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    tavily_key = os.getenv("TAVILY_API_KEY")
+
+    if not anthropic_key:
+        raise ValueError("ANTHROPIC_API_KEY not found in environment variables. Please set it in your .env file.")
+    if not tavily_key:
+        raise ValueError("TAVILY_API_KEY not found in environment variables. Please set it in your .env file.")
+
+    print("✅ API keys loaded successfully!")
+
+
+@functools.cache
+def get_llm():
+    """Shared Claude Opus client (cached invoke/ainvoke, see llm_cache)."""
+    load_environment()
+    return CachedChatAnthropic(
+        model="claude-opus-4-6",  # Best for agents (Haiku is faster/cheaper alternative)
+        temperature=0,
+        max_tokens=4096,
+        timeout=None,
+        max_retries=2,
+    )
+
+
+@functools.cache
+def get_llm_fast():
+    """Small/fast Claude Haiku client for cheap internal calls (summaries,
+    routing) where Opus-grade quality buys nothing."""
+    load_environment()
+    return CachedChatAnthropic(
+        model="claude-3-5-haiku-latest",
+        temperature=0,
+        max_tokens=1024,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _embed_query(text: str) -> tuple:
+    """Embed a query locally with the shared MiniLM model (same instance the
+    semantic cache uses), memoized so repeated phrasings cost nothing.
+
+    Imported lazily: sentence-transformers pulls in torch, and every
+    entrypoint imports bootstrap - only callers that actually embed
+    (vector-capable stores) should pay for that."""
+    from semantic_cache import get_embedder
+    return tuple(float(x) for x in get_embedder().encode(text))
+
+
+class ContextWindowMiddleware(AgentMiddleware):
+    """Bounds the prompt sent to Claude as the conversation grows.
+
+    Once the history passes MAX_MESSAGES, the first HEAD and last ~TAIL
+    messages are kept verbatim and everything in between is collapsed into
+    one Haiku-written summary folded into the system prompt, so per-turn
+    input tokens (and with them time-to-first-token) stay O(1) regardless
+    of session length. Summaries are cached by a hash of the summarized
+    span, so a given span is only ever summarized once.
+    """
+
+    MAX_MESSAGES = 20
+    HEAD = 2
+    TAIL = 16
+
+    def __init__(self):
+        super().__init__()
+        self._summary_cache = {}
+
+    def _summarize(self, middle):
+        key = hashlib.sha256(
+            "\x00".join(str(getattr(m, "content", "")) for m in middle).encode()
+        ).hexdigest()
+        summary = self._summary_cache.get(key)
+        if summary is None:
+            transcript = "\n".join(f"{m.type}: {m.content}" for m in middle)
+            # Tagged so stream consumers can drop these tokens: this invoke
+            # runs inside the model node with the graph's callbacks attached,
+            # and under stream_mode="messages" it would otherwise leak into
+            # the answer stream
+            response = get_llm_fast().invoke(
+                [
+                    SystemMessage(
+                        content="Summarize this conversation excerpt in one short paragraph. "
+                        "Keep facts, decisions and user preferences; drop pleasantries."
+                    ),
+                    HumanMessage(content=transcript),
+                ],
+                config={"tags": [SUMMARIZER_TAG]},
+            )
+            summary = response.content
+            self._summary_cache[key] = summary
+        return summary
+
+    def wrap_model_call(self, request: ModelRequest, handler):
+        messages = request.messages
+        if len(messages) <= self.MAX_MESSAGES:
+            return handler(request)
+
+        head = list(messages[:self.HEAD])
+        # Never start the kept tail on a ToolMessage: its tool-calling
+        # AIMessage would land in the summarized span and the API rejects
+        # orphaned tool_result blocks
+        cut = len(messages) - self.TAIL
+        while cut < len(messages) and isinstance(messages[cut], ToolMessage):
+            cut += 1
+        tail = list(messages[cut:])
+        summary = self._summarize(messages[self.HEAD:cut])
+
+        # langchain_anthropic only accepts a system message at the very
+        # front of the list, so the summary is folded into the system
+        # prompt rather than injected mid-conversation. It goes after any
+        # cache_control blocks so the cached prefix stays byte-stable.
+        summary_text = f"Summary of earlier conversation:\n{summary}"
+        prompt = request.system_prompt
+        if prompt is None:
+            new_prompt = summary_text
+        elif isinstance(prompt, SystemMessage):
+            blocks = prompt.content
+            if isinstance(blocks, str):
+                blocks = [{"type": "text", "text": blocks}]
+            new_prompt = SystemMessage(
+                content=list(blocks) + [{"type": "text", "text": summary_text}]
+            )
+        else:
+            new_prompt = f"{prompt}\n\n{summary_text}"
+
+        return handler(request.override(messages=head + tail, system_prompt=new_prompt))
+
+
+class MemoryState(AgentState):
+    # Indices of the most recent human/AI message, maintained incrementally
+    # so the hooks never have to rescan the whole (growing) message list
+    last_human_idx: int
+    last_ai_idx: int
+
+
+class MemoryMiddleware(AgentMiddleware):
+    # store.search results are cached for 10 minutes (bounded LRU) and
+    # store.put runs on a background thread, so neither AgentCore round-trip
+    # blocks the hot path before the LLM call
+    SEARCH_CACHE_TTL = 600
+    SEARCH_CACHE_MAX = 256
+
+    # Pre-generated uuid pool: uuid4() reads from the OS entropy source, so
+    # ids are minted ahead of time on the background executor and popped in
+    # O(1) on the hot path
+    UUID_POOL_TARGET = 64
+    UUID_POOL_REFILL_AT = 16
+
+    state_schema = MemoryState
+
+    def __init__(self):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._search_cache = OrderedDict()  # key -> (timestamp, results)
+        self._uuid_pool = deque(uuid.uuid4().hex for _ in range(self.UUID_POOL_TARGET))
+        self._store_accepts_vectors = None  # decided on first search
+
+    def _supports_query_vector(self, store: BaseStore) -> bool:
+        """Check once whether this store's search() takes a query_vector.
+
+        AgentCoreMemoryStore does its own embedding server-side and has no
+        such parameter; probing the signature up front means unsupported
+        stores never pay for a local MiniLM encode (or the model load)."""
+        if self._store_accepts_vectors is None:
+            try:
+                params = inspect.signature(store.search).parameters
+                self._store_accepts_vectors = "query_vector" in params
+            except (TypeError, ValueError):
+                self._store_accepts_vectors = False
+        return self._store_accepts_vectors
+
+    def _refill_uuid_pool(self):
+        while len(self._uuid_pool) < self.UUID_POOL_TARGET:
+            self._uuid_pool.append(uuid.uuid4().hex)
+
+    def _next_id(self) -> str:
+        """Pop a pre-generated id, topping the pool up in the background."""
+        if len(self._uuid_pool) < self.UUID_POOL_REFILL_AT:
+            self._executor.submit(self._refill_uuid_pool)
+        try:
+            return self._uuid_pool.popleft()
+        except IndexError:
+            return uuid.uuid4().hex
+
+    def _store_message(self, store: BaseStore, namespace, msg):
+        """Write a message to the store off the hot path.
+
+        The id comes from the pre-warmed pool and the put (including the
+        store's own serialization) runs on the background executor, so
+        neither the entropy read nor the store round-trip blocks the LLM
+        call. The payload must be {"message": <BaseMessage>}: that's the
+        shape AgentCoreMemoryStore.put converts into a conversational
+        event, and what the read path looks up.
+        """
+        key = self._next_id()
+        future = self._executor.submit(
+            lambda: store.put(namespace, key, {"message": msg})
+        )
+        future.add_done_callback(self._log_write_errors)
+
+    @staticmethod
+    def _log_write_errors(future):
+        """Surface failures from the fire-and-forget store writes; without
+        this a raised exception dies silently inside the executor."""
+        exc = future.exception()
+        if exc is not None:
+            print(f"Memory write error: {exc}")
+
+    def _cached_search(self, store: BaseStore, actor_id: str, query: str):
+        """store.search with a small TTL'd LRU keyed by actor + query prefix."""
+        key = hashlib.sha256((actor_id + query[:512]).encode()).hexdigest()
+        now = time.time()
+        hit = self._search_cache.get(key)
+        if hit and now - hit[0] < self.SEARCH_CACHE_TTL:
+            self._search_cache.move_to_end(key)
+            return hit[1]
+
+        # Pass a locally computed embedding so the memory service skips its
+        # own embedding step - but only when this store version actually
+        # accepts vectors, so unsupported stores never embed for nothing
+        if self._supports_query_vector(store):
+            results = store.search(
+                ("preferences", actor_id),
+                query_vector=list(_embed_query(query)),
+                limit=5
+            )
+        else:
+            results = store.search(
+                ("preferences", actor_id),
+                query=query,
+                limit=5
+            )
+        self._search_cache[key] = (now, results)
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > self.SEARCH_CACHE_MAX:
+            self._search_cache.popitem(last=False)
+        return results
+
+    @staticmethod
+    def _refresh_indices(state):
+        """Bring the last-human/last-AI indices up to date.
+
+        Messages only ever append, so this scans just the tail added since
+        the previous turn - amortized O(1) bookkeeping instead of the old
+        O(n) reversed() scan over the whole conversation in each hook.
+        """
+        messages = state.get("messages", [])
+        last_human = state.get("last_human_idx", -1)
+        last_ai = state.get("last_ai_idx", -1)
+        for i in range(max(last_human, last_ai) + 1, len(messages)):
+            if isinstance(messages[i], HumanMessage):
+                last_human = i
+            elif isinstance(messages[i], AIMessage):
+                last_ai = i
+        return last_human, last_ai
+
+    # Before-model hook: saves messages and retrieves long-term memories
+    def before_model(self, state: AgentState, config: RunnableConfig, *, store: BaseStore):
+        """
+        Hook that runs before LLM invocation to:
+        1. Save the latest human message to long-term memory
+        2. Retrieve relevant user preferences and memories
+        3. Append memories to the context
+        """
+        actor_id = config["configurable"]["actor_id"]
+        thread_id = config["configurable"]["thread_id"]
+
+        # Namespace for this specific session
+        namespace = (actor_id, thread_id)
+        messages = state.get("messages", [])
+        last_human_idx, last_ai_idx = self._refresh_indices(state)
+
+        # Save the last human message to long-term memory
+        if last_human_idx >= 0:
+            msg = messages[last_human_idx]
+            # Fire-and-forget write: don't block the LLM call on the store RTT
+            self._store_message(store, namespace, msg)
+
+            # OPTIONAL: Retrieve user preferences from long-term memory
+            # Search across all sessions for this actor (cached, see above)
+            try:
+                preferences = self._cached_search(store, actor_id, msg.content)
+
+                # If we found relevant memories, add them to the context
+                if preferences:
+                    memory_context = "\n".join([
+                        f"Memory: {item.value.get('message', '')}"
+                        for item in preferences
+                    ])
+                    # You can append this to the messages or use it another way
+                    print(f"Retrieved memories: {memory_context}")
+            except Exception as e:
+                print(f"Memory retrieval error: {e}")
+
+        return {"messages": messages, "last_human_idx": last_human_idx, "last_ai_idx": last_ai_idx}
+
+
+    # OPTIONAL: After-model hook to save AI responses
+    def after_model(self, state, config: RunnableConfig, *, store: BaseStore):
+        """
+        Hook that runs after LLM invocation to save AI messages to long-term memory
+        """
+        actor_id = config["configurable"]["actor_id"]
+        thread_id = config["configurable"]["thread_id"]
+        namespace = (actor_id, thread_id)
+
+        messages = state.get("messages", [])
+        last_human_idx, last_ai_idx = self._refresh_indices(state)
+
+        # Save the last AI message (background write, same as before_model)
+        if last_ai_idx >= 0:
+            self._store_message(store, namespace, messages[last_ai_idx])
+
+        return {"last_human_idx": last_human_idx, "last_ai_idx": last_ai_idx}
+
+
+def _cacheable_system_prompt(text: str) -> SystemMessage:
+    """Wrap a system prompt in an Anthropic cache_control content block.
+
+    With cache_control the API reuses its server-side KV-cache for this
+    fixed prefix across turns instead of re-processing it on every call -
+    the cloud analog of caching the encoded prompt locally. (No client-side
+    tokenization happens in this stack, so there is nothing to lru_cache
+    here.)
+    """
+    return SystemMessage(content=[{
+        "type": "text",
+        "text": text,
+        "cache_control": {"type": "ephemeral"},
+    }])
+
+
+@functools.cache
+def get_agent(memory: bool = False, system_prompt: str = None):
+    """Build (once) and return a ReAct agent executor.
+
+    memory=True wires in AgentCore checkpointing, the long-term memory store
+    and MemoryMiddleware, using the FAQ system prompt unless one is given.
+    Multiple tool_calls on one turn already run concurrently in the stock
+    tool node, so tools are passed straight through.
+    """
+    llm = get_llm()
+    tools = [*TOOLS]
+
+    if not memory:
+        return create_agent(
+            llm,
+            tools,
+            system_prompt=_cacheable_system_prompt(system_prompt) if system_prompt else None,
+        )
+
+    # AgentCore deps are only needed for the memory-enabled agent, so the
+    # plain agents don't pay for (or require) them at import time
+    from langgraph_checkpoint_aws import AgentCoreMemorySaver, AgentCoreMemoryStore
+
+    # Checkpointer for state persistence: sessions are saved and persisted
+    # for actor_id/session_id combinations. The store keeps long term
+    # memories such as preferences and facts across sessions.
+    checkpointer = AgentCoreMemorySaver(memory_id=MEMORY_ID)
+    store = AgentCoreMemoryStore(memory_id=MEMORY_ID)
+
+    return create_agent(
+        model=llm,
+        tools=tools,
+        checkpointer=checkpointer,
+        store=store,
+        middleware=[ContextWindowMiddleware(), MemoryMiddleware()],
+        system_prompt=_cacheable_system_prompt(system_prompt or FAQ_SYSTEM_PROMPT)
+    )
@@ -1,57 +1,23 @@
 # pip install langgraph langchain-anthropic tavily-python python-dotenv
 
-import os
-from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_anthropic import ChatAnthropic
-from tools import TOOLS
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
+import bootstrap
+from langchain_core.messages import HumanMessage
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 
 app = BedrockAgentCoreApp()
-# Load environment variables
-load_dotenv()
 
-# Validate API keys
-anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-tavily_key = os.getenv("TAVILY_API_KEY")
 REGION = "us-east-1"
 MEMORY_ID = "memory_for_lagchain_agent-ZgBqYyGADI"
 
-if not anthropic_key:
-    raise ValueError("ANTHROPIC_API_KEY not found in environment variables. Please set it in your .env file.")
-if not tavily_key:
-    raise ValueError("TAVILY_API_KEY not found in environment variables. Please set it in your .env file.")
+# ============ 1. Initialize LLM and Agent ============
+# Env parsing, key validation, the LLM client and the ReAct agent all come
+# from the shared lazy bootstrap (see bootstrap.py), memoized across modules
+llm = bootstrap.get_llm()
 
-print("✅ API keys loaded successfully!")
-
-
-
-
-# ============ 1. Initialize LLM and Tools ============
-llm = ChatAnthropic(
-    model="claude-opus-4-6",  # Best for agents (Haiku is faster/cheaper alternative)
-    temperature=0,
-    max_tokens=4096,
-    timeout=None,
-    max_retries=2,
+agent_executor = bootstrap.get_agent(
+    system_prompt="You are a helpful assistant that answers questions using tools when necessary. Always try to use the tools if they can help you answer the question more accurately. If you don't know the answer, use the search tool to find it. Be concise and informative in your responses."
 )
 
-
-tools=[*TOOLS]
-
-# ============ 2. Create ReAct Agent ============
-# This creates a standard ReAct agent that:
-# - Uses LLM to decide when to call tools
-# - Handles tool execution and response formatting automatically
-# - Maintains conversation history in MessagesState format
-agent_executor = create_agent(
-    model=llm, 
-    tools=tools,
-    system_message=SystemMessage(content="You are a helpful assistant that answers questions using tools when necessary. Always try to use the tools if they can help you answer the question more accurately. If you don't know the answer, use the search tool to find it. Be concise and informative in your responses.")    
-
-    )
-
 # # ============ 3. Visualize the Graph ============
 # print("\n📊 Agent Graph Structure (ReAct Pattern):")
 # print("=" * 60)
@@ -63,34 +29,7 @@ agent_executor = create_agent(
 #     print("💡 Tip: Install graphviz for PNG/SVG exports: `pip install graphviz`")
 
 # ============ 4. Helper: Print message chunks clearly ============
-def print_stream_chunk(chunk, step_num):
-    """Print different message types during streaming"""
-    if "messages" not in chunk:
-        return
-    
-    new_messages = chunk["messages"]
-    if not new_messages:
-        return
-    
-    msg = new_messages[-1]
-    
-    # Tool call decision (LLM wants to use a tool)
-    if hasattr(msg, 'tool_calls') and msg.tool_calls:
-        print(f"\n[Step {step_num}] 🤖 Agent decided to call tool:")
-        for tool_call in msg.tool_calls:
-            print(f"   🔧 {tool_call['name']}({tool_call['args']})")
-    
-    # Tool response (results from Tavily)
-    elif isinstance(msg, ToolMessage):
-        print(f"\n[Step {step_num}] 🔍 Tool response received:")
-        # Truncate long responses for readability
-        content = msg.content[:500] + "..." if len(msg.content) > 500 else msg.content
-        print(f"   💡 {content}")
-    
-    # Final assistant response
-    elif isinstance(msg, AIMessage) and msg.content and not getattr(msg, 'tool_calls', None):
-        print(f"\n[Step {step_num}] ✅ FINAL ANSWER:")
-        print(f"\n🤖 {msg.content}")
+# Shared with the other agent scripts, see agent_utils.py
 # # Optional: Save Mermaid diagram for documentation
 # try:
 #     mermaid = agent_executor.get_graph().draw_mermaid()
@@ -139,25 +78,17 @@ def agent_invocation(payload, context):
         print(f"🔍 Processing user query: {user_message}")
         # print(f"📋 AWS Context: {context.function_name if context else 'No context'}")
         
-        # Initialize variables
-        step = 0
-        final_answer = None
-        
-        # Stream all intermediate steps
+        # Run the graph to completion with a plain invoke: the caller only
+        # ever sees the final dict, so streaming here bought nothing but
+        # per-node generator steps and intermediate state copies. The
+        # interactive CLI keeps streaming where the chunks are user-visible.
         try:
-            for chunk in agent_executor.stream(
-                {"messages": [HumanMessage(content=user_message)]},
-                stream_mode="values"
-            ):
-                step += 1
-                print_stream_chunk(chunk, step)
-                
-                # Capture final answer for summary
-                if "messages" in chunk:
-                    last_msg = chunk["messages"][-1]
-                    if isinstance(last_msg, AIMessage) and last_msg.content and not getattr(last_msg, 'tool_calls', None):
-                        final_answer = last_msg.content
-        
+            result = agent_executor.invoke(
+                {"messages": [HumanMessage(content=user_message)]}
+            )
+            final_answer = result["messages"][-1].content
+            step = len(result["messages"])
+
         except Exception as e:
             error_msg = f"Error during agent execution: {str(e)}"
             print(f"❌ {error_msg}")
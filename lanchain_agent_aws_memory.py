@@ -1,151 +1,30 @@
 # pip install langgraph langchain-anthropic tavily-python python-dotenv
 
-import os
-from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_anthropic import ChatAnthropic
-from tools import TOOLS
-from langgraph_checkpoint_aws import AgentCoreMemorySaver , AgentCoreMemoryStore
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
-from langchain_core.runnables import RunnableConfig
+import bootstrap
+from agent_utils import chunk_text
+from langchain_core.messages import HumanMessage
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from langchain.agents.middleware import AgentMiddleware, AgentState, ModelRequest, ModelResponse
-from langgraph.store.base import BaseStore
-import uuid
+from semantic_cache import SemanticCache
 
 
 app = BedrockAgentCoreApp()
-# Load environment variables
-load_dotenv()
 
-# Validate API keys
-anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-tavily_key = os.getenv("TAVILY_API_KEY")
-MEMORY_ID = "memory_for_lagchain_agent-ZgBqYyGADI"
+# ============ 1. Initialize LLM and Agent ============
+# Env parsing, key validation, the LLM client and the memory-enabled ReAct
+# agent (AgentCore checkpointer + store + MemoryMiddleware, FAQ system
+# prompt) all come from the shared lazy bootstrap (see bootstrap.py)
+llm = bootstrap.get_llm()
 
-if not anthropic_key:
-    raise ValueError("ANTHROPIC_API_KEY not found in environment variables. Please set it in your .env file.")
-if not tavily_key:
-    raise ValueError("TAVILY_API_KEY not found in environment variables. Please set it in your .env file.")
+agent_executor = bootstrap.get_agent(memory=True)
 
-print("✅ API keys loaded successfully!")
+# Semantic cache in front of the agent, namespaced per actor_id so cached
+# answers never leak across users. One instance per actor, created lazily.
+_semantic_caches = {}
 
-# Initialize checkpointer for state persistence. No additional setup required.
-# Sessions will be saved and persisted for actor_id/session_id combinations
-checkpointer = AgentCoreMemorySaver(memory_id=MEMORY_ID)
-# Initialize store for saving and searching over long term memories
-# such as preferences and facts across sessions
-store = AgentCoreMemoryStore(memory_id=MEMORY_ID)
-# Initialize Tavily search tool with custom description for better tool selection
-
-class MemoryMiddleware(AgentMiddleware):
-    # Pre-model hook: saves messages and retrieves long-term memories
-    def pre_model_hook(self, state: AgentState, config: RunnableConfig, *, store: BaseStore):
-        """
-        Hook that runs before LLM invocation to:
-        1. Save the latest human message to long-term memory
-        2. Retrieve relevant user preferences and memories
-        3. Append memories to the context
-        """
-        actor_id = config["configurable"]["actor_id"]
-        thread_id = config["configurable"]["thread_id"]
-        
-        # Namespace for this specific session
-        namespace = (actor_id, thread_id)
-        messages = state.get("messages", [])
-        
-        # Save the last human message to long-term memory
-        for msg in reversed(messages):
-            if isinstance(msg, HumanMessage):
-                store.put(namespace, str(uuid.uuid4()), {"message": msg})
-                
-                # OPTIONAL: Retrieve user preferences from long-term memory
-                # Search across all sessions for this actor
-                user_preferences_namespace = ("preferences", actor_id)
-                try:
-                    preferences = store.search(
-                        user_preferences_namespace, 
-                        query=msg.content, 
-                        limit=5
-                    )
-                    
-                    # If we found relevant memories, add them to the context
-                    if preferences:
-                        memory_context = "\n".join([
-                            f"Memory: {item.value.get('message', '')}" 
-                            for item in preferences
-                        ])
-                        # You can append this to the messages or use it another way
-                        print(f"Retrieved memories: {memory_context}")
-                except Exception as e:
-                    print(f"Memory retrieval error: {e}")
-                break
-        
-        return {"messages": messages}
-
-
-    # OPTIONAL: Post-model hook to save AI responses
-    def post_model_hook(state, config: RunnableConfig, *, store: BaseStore):
-        """
-        Hook that runs after LLM invocation to save AI messages to long-term memory
-        """
-        actor_id = config["configurable"]["actor_id"]
-        thread_id = config["configurable"]["thread_id"]
-        namespace = (actor_id, thread_id)
-        
-        messages = state.get("messages", [])
-        
-        # Save the last AI message
-        for msg in reversed(messages):
-            if isinstance(msg, AIMessage):
-                store.put(namespace, str(uuid.uuid4()), {"message": msg})
-                break
-        
-        return state
-
-
-
-# ============ 1. Initialize LLM and Tools ============
-llm = ChatAnthropic(
-    model="claude-opus-4-6",  # Best for agents (Haiku is faster/cheaper alternative)
-    temperature=0,
-    max_tokens=4096,
-    timeout=None,
-    max_retries=2,
-)
-
-
-
-tools=[*TOOLS]
-
-system_prompt = """You are a helpful FAQ assistant with access to a knowledge base and user memory.
-
-Your goal is to answer user questions accurately using the available tools while remembering user preferences.
-
-Guidelines:
-1. Check if you have relevant user preferences or history from previous conversations
-2. Use the tools to find relevant information from the knowledge base
-3. If the query is complex, use reformulate_query to search different aspects
-4. Personalize responses based on user preferences when relevant
-5. Always provide a clear, concise answer based on the retrieved information
-6. If you cannot find relevant information, clearly state that
-
-Think step-by-step and use tools strategically to provide the best answer."""
-
-# ============ 2. Create ReAct Agent ============
-# This creates a standard ReAct agent that:
-# - Uses LLM to decide when to call tools
-# - Handles tool execution and response formatting automatically
-# - Maintains conversation history in MessagesState format
-agent_executor = create_agent(
-    model=llm, 
-    tools=tools,
-    checkpointer=checkpointer ,
-    store=store,
-    middleware=[MemoryMiddleware()],
-    system_prompt=system_prompt  
-
-    )
+def _get_semantic_cache(actor_id: str) -> SemanticCache:
+    if actor_id not in _semantic_caches:
+        _semantic_caches[actor_id] = SemanticCache(namespace=actor_id, threshold=0.92)
+    return _semantic_caches[actor_id]
 
 # # ============ 3. Visualize the Graph ============
 # print("\n📊 Agent Graph Structure (ReAct Pattern):")
@@ -158,34 +37,7 @@ agent_executor = create_agent(
 #     print("💡 Tip: Install graphviz for PNG/SVG exports: `pip install graphviz`")
 
 # ============ 4. Helper: Print message chunks clearly ============
-def print_stream_chunk(chunk, step_num):
-    """Print different message types during streaming"""
-    if "messages" not in chunk:
-        return
-    
-    new_messages = chunk["messages"]
-    if not new_messages:
-        return
-    
-    msg = new_messages[-1]
-    
-    # Tool call decision (LLM wants to use a tool)
-    if hasattr(msg, 'tool_calls') and msg.tool_calls:
-        print(f"\n[Step {step_num}] 🤖 Agent decided to call tool:")
-        for tool_call in msg.tool_calls:
-            print(f"   🔧 {tool_call['name']}({tool_call['args']})")
-    
-    # Tool response (results from Tavily)
-    elif isinstance(msg, ToolMessage):
-        print(f"\n[Step {step_num}] 🔍 Tool response received:")
-        # Truncate long responses for readability
-        content = msg.content[:500] + "..." if len(msg.content) > 500 else msg.content
-        print(f"   💡 {content}")
-    
-    # Final assistant response
-    elif isinstance(msg, AIMessage) and msg.content and not getattr(msg, 'tool_calls', None):
-        print(f"\n[Step {step_num}] ✅ FINAL ANSWER:")
-        print(f"\n🤖 {msg.content}")
+# Shared with the other agent scripts, see agent_utils.py
 # # Optional: Save Mermaid diagram for documentation
 # try:
 #     mermaid = agent_executor.get_graph().draw_mermaid()
@@ -196,19 +48,23 @@ def print_stream_chunk(chunk, step_num):
 #     pass
 
 # =================== Bedrock Agentcore integration ==================
-# 
+#
 @app.entrypoint
-def agent_invocation(payload, context):
+async def agent_invocation(payload, context):
     """
-    Handler for agent invocation in AWS Bedrock AgentCore
-    
+    Streaming handler for agent invocation in AWS Bedrock AgentCore
+
     Args:
         payload: Dict containing 'prompt' key with user query
         context: AWS Lambda context object
-    
-    Returns:
-        Dict with 'result' key containing agent response
-    
+
+    Yields:
+        {"delta": ...} events with answer tokens as they are generated,
+        then a final {"result": ..., "success": True, "done": True} event
+        (error events carry an 'error' key instead). Callers see the first
+        token at first-token latency instead of waiting for the whole
+        generation.
+
     Expected payload format:
     {
         "prompt": "Your question here"
@@ -217,11 +73,13 @@ def agent_invocation(payload, context):
     try:
         # Validate payload
         if not payload or not isinstance(payload, dict):
-            return {
+            yield {
                 "error": "Invalid payload format. Expected JSON dict with 'prompt' key",
-                "result": None
+                "result": None,
+                "done": True
             }
-        
+            return
+
         # Extract user message
         user_message = payload.get("prompt", "").strip()
             # Extract or generate actor_id and thread_id
@@ -237,64 +95,92 @@ def agent_invocation(payload, context):
         }
 
         if not user_message:
-            return {
+            yield {
                 "error": "No prompt found in input. Please provide a 'prompt' key with your question.",
-                "result": None
+                "result": None,
+                "done": True
             }
-        
+            return
+
         print(f"🔍 Processing user query: {user_message}")
         # print(f"📋 AWS Context: {context.function_name if context else 'No context'}")
-        
-        # Initialize variables
-        step = 0
-        final_answer = None
-        
-        # Stream all intermediate steps
+
+        # Semantic cache lookup: short-circuit on a close-enough prior query
+        cache = _get_semantic_cache(actor_id)
+        hit = cache.get(user_message, threshold=0.92)
+        if hit:
+            print("⚡ Answer served from semantic cache")
+            yield {"delta": hit}
+            yield {
+                "result": hit,
+                "success": True,
+                "cached": True,
+                "done": True
+            }
+            return
+
+        final_answer = ""
+
+        # Forward answer tokens to the caller as Claude generates them
         try:
-            for chunk in agent_executor.stream(
-                {"messages": [HumanMessage(content=user_message)]},config=config,
-                stream_mode="values"
+            async for msg_chunk, metadata in agent_executor.astream(
+                {"messages": [HumanMessage(content=user_message)]}, config=config,
+                stream_mode="messages"
             ):
-                step += 1
-                print_stream_chunk(chunk, step)
-                
-                # Capture final answer for summary
-                if "messages" in chunk:
-                    last_msg = chunk["messages"][-1]
-                    if isinstance(last_msg, AIMessage) and last_msg.content and not getattr(last_msg, 'tool_calls', None):
-                        final_answer = last_msg.content
-        
+                # Only forward the assistant's answer tokens, not tool chatter
+                # or the internal history-summarizer call (which also runs in
+                # the model node once a conversation gets long)
+                if metadata.get("langgraph_node") not in ("agent", "model"):
+                    continue
+                if bootstrap.SUMMARIZER_TAG in (metadata.get("tags") or []):
+                    continue
+                if getattr(msg_chunk, 'tool_calls', None) or getattr(msg_chunk, 'tool_call_chunks', None):
+                    continue
+                delta = chunk_text(msg_chunk.content)
+                if delta:
+                    final_answer += delta
+                    yield {"delta": delta}
+
         except Exception as e:
             error_msg = f"Error during agent execution: {str(e)}"
             print(f"❌ {error_msg}")
-            return {
+            yield {
                 "error": error_msg,
-                "result": None
+                "result": None,
+                "done": True
             }
-        
+            return
+
         # Validate final answer
         if not final_answer:
-            return {
+            yield {
                 "error": "Agent failed to generate a response",
-                "result": None
+                "result": None,
+                "done": True
             }
-        
-        print(f"\n✅ Agent completed in {step} steps")
+            return
+
+        # Cache the answer for future paraphrased repeats. Only safe because
+        # temperature=0 keeps the model deterministic for a given prompt.
+        if llm.temperature == 0:
+            cache.put(user_message, final_answer)
+
         print(f"📤 Final answer: {final_answer[:200]}..." if len(final_answer) > 200 else f"📤 Final answer: {final_answer}")
-        
-        return {
+
+        yield {
             "result": final_answer,
-            "steps": step,
-            "success": True
+            "success": True,
+            "done": True
         }
-    
+
     except Exception as e:
         error_msg = f"Unexpected error in agent_invocation: {str(e)}"
         print(f"❌ {error_msg}")
-        return {
+        yield {
             "error": error_msg,
             "result": None,
-            "success": False
+            "success": False,
+            "done": True
         }
 
 
@@ -0,0 +1,64 @@
+# Exact-match LLM response cache for deterministic temperature=0 calls
+# Identical (model, messages, tools) triples always produce the same output
+# at temperature=0, so a SHA256-keyed on-disk lookup can replace the whole
+# network + inference roundtrip on repeated calls (dev loops, re-runs, FAQs).
+
+# pip install diskcache
+
+import hashlib
+import json
+
+import diskcache
+from langchain_anthropic import ChatAnthropic
+from langchain_core.load import dumpd
+
+# Shared on-disk cache (LRU eviction), 24h TTL per entry
+_CACHE = diskcache.Cache(".cache/llm")
+_TTL_SECONDS = 24 * 60 * 60
+
+
+def cache_key(model: str, input, kwargs: dict) -> str:
+    """SHA256 over the serialized (model, messages, tools/kwargs) triple.
+
+    kwargs carries the bound tool schemas, so changing TOOLS invalidates
+    existing entries automatically.
+    """
+    payload = {
+        "model": model,
+        "messages": dumpd(input),
+        "kwargs": kwargs,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class CachedChatAnthropic(ChatAnthropic):
+    """ChatAnthropic with an exact-prompt on-disk cache.
+
+    Pure wrapper around invoke/ainvoke: on a key hit the pickled AIMessage is
+    returned without touching the network; on a miss the real call runs and
+    the result is stored. Caching is skipped entirely unless temperature is
+    exactly 0 (None means the provider default, which is nondeterministic).
+    """
+
+    def invoke(self, input, config=None, **kwargs):
+        # Only temperature=0 is deterministic; None means the provider
+        # default (~1.0), so it must bypass the cache too
+        if self.temperature != 0:
+            return super().invoke(input, config=config, **kwargs)
+        key = cache_key(self.model, input, kwargs)
+        result = _CACHE.get(key)
+        if result is None:
+            result = super().invoke(input, config=config, **kwargs)
+            _CACHE.set(key, result, expire=_TTL_SECONDS)
+        return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        if self.temperature != 0:
+            return await super().ainvoke(input, config=config, **kwargs)
+        key = cache_key(self.model, input, kwargs)
+        result = _CACHE.get(key)
+        if result is None:
+            result = await super().ainvoke(input, config=config, **kwargs)
+            _CACHE.set(key, result, expire=_TTL_SECONDS)
+        return result
@@ -0,0 +1,90 @@
+# Semantic response cache for agent queries
+# Embeds the incoming query locally and does a cosine-similarity lookup over
+# prior (query, final_answer) pairs so paraphrased repeats skip the whole
+# ReAct loop (one embedding + ANN search instead of an LLM + tool roundtrip).
+
+# pip install sentence-transformers faiss-cpu
+
+import json
+import os
+import time
+import threading
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+# Shared local embedder (no API latency). Lazily loaded because the model
+# download/load takes a few seconds and not every entrypoint needs it.
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> SentenceTransformer:
+    """Return the shared all-MiniLM-L6-v2 embedder, loading it on first use."""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = SentenceTransformer("all-MiniLM-L6-v2")
+    return _embedder
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache of (query, final_answer) pairs.
+
+    Backed by a faiss.IndexFlatIP over normalized embeddings (inner product ==
+    cosine similarity) plus a sidecar JSON of {id: {"q":..., "a":..., "ts":...}}.
+    Persisted under .cache/ so repeated script runs keep their hits.
+
+    Use a distinct `namespace` per user (e.g. actor_id) so cached answers
+    never leak across users.
+    """
+
+    def __init__(self, cache_dir: str = ".cache", namespace: str = "default",
+                 threshold: float = 0.92):
+        self.threshold = threshold
+        os.makedirs(cache_dir, exist_ok=True)
+        suffix = "" if namespace == "default" else f"-{namespace}"
+        self._index_path = os.path.join(cache_dir, f"qcache{suffix}.faiss")
+        self._meta_path = os.path.join(cache_dir, f"qcache{suffix}.json")
+        self._lock = threading.Lock()
+
+        # Load persisted state if present, else start empty
+        if os.path.exists(self._index_path) and os.path.exists(self._meta_path):
+            self._index = faiss.read_index(self._index_path)
+            with open(self._meta_path) as f:
+                self._meta = json.load(f)
+        else:
+            dim = get_embedder().get_sentence_embedding_dimension()
+            self._index = faiss.IndexFlatIP(dim)
+            self._meta = {}
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = get_embedder().encode([text], normalize_embeddings=True)
+        return np.asarray(vec, dtype=np.float32)
+
+    def get(self, query: str, threshold: float = None):
+        """Return the cached answer for the closest prior query, or None on miss."""
+        if self._index.ntotal == 0:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        scores, ids = self._index.search(self._embed(query), 1)
+        score, idx = float(scores[0][0]), int(ids[0][0])
+        if idx < 0 or score < threshold:
+            return None
+        entry = self._meta.get(str(idx))
+        return entry["a"] if entry else None
+
+    def put(self, query: str, answer: str):
+        """Store a (query, answer) pair and persist the index to disk."""
+        if not query or not answer:
+            return
+        with self._lock:
+            idx = self._index.ntotal
+            self._index.add(self._embed(query))
+            self._meta[str(idx)] = {"q": query, "a": answer, "ts": time.time()}
+            faiss.write_index(self._index, self._index_path)
+            with open(self._meta_path, "w") as f:
+                json.dump(self._meta, f)
@@ -0,0 +1,22 @@
+# Regression test for the MemoryMiddleware hook names: the framework only
+# calls before_model/after_model, so methods with invented names would be
+# silently ignored and no memories would ever be stored or retrieved.
+
+import pytest
+
+bootstrap = pytest.importorskip("bootstrap")
+
+from langchain.agents.middleware import AgentMiddleware
+
+
+def test_memory_middleware_overrides_framework_hooks():
+    # The middleware must override the real AgentMiddleware hook points,
+    # otherwise create_agent wires in the no-op base implementations
+    assert bootstrap.MemoryMiddleware.before_model is not AgentMiddleware.before_model
+    assert bootstrap.MemoryMiddleware.after_model is not AgentMiddleware.after_model
+
+
+def test_no_stale_hook_names():
+    # Guard against the old invented names creeping back in
+    assert not hasattr(bootstrap.MemoryMiddleware, "pre_model_hook")
+    assert not hasattr(bootstrap.MemoryMiddleware, "post_model_hook")
@@ -1,8 +1,57 @@
+import hashlib
+
+import diskcache
 import requests
 from typing import Dict
 from langchain_core.tools import tool
 from langchain_community.tools.tavily_search import TavilySearchResults
 
+# On-disk cache of (query -> search results), 1 hour TTL. Search results for
+# identical queries rarely change within the hour, and a cache hit skips the
+# whole Tavily HTTPS round-trip.
+_SEARCH_CACHE = diskcache.Cache(".cache/tavily")
+_SEARCH_TTL_SECONDS = 3600
+
+
+class CachedTavilySearch(TavilySearchResults):
+    """TavilySearchResults with a 1h on-disk result cache.
+
+    Keys are the SHA256 of the lowercased, stripped query so trivially
+    re-phrased whitespace/case variants hit the same entry. Error payloads
+    are never cached: with response_format="content_and_artifact" a failed
+    search comes back as a (repr(e), {}) tuple, recognized by its string
+    first element. Note: the underlying
+    TavilySearchAPIWrapper issues a fresh requests.post per search (no
+    session keep-alive); connection pooling is deliberately left out here
+    since the cache already absorbs repeated queries.
+    """
+
+    @staticmethod
+    def _is_error(result) -> bool:
+        # content_and_artifact tools return (content, raw); on failure the
+        # content slot holds repr(e) instead of the parsed result list
+        if isinstance(result, tuple) and result:
+            return isinstance(result[0], str)
+        return isinstance(result, (str, Exception))
+
+    def _run(self, query: str, **kwargs):
+        key = hashlib.sha256(query.lower().strip().encode()).hexdigest()
+        result = _SEARCH_CACHE.get(key)
+        if result is None:
+            result = super()._run(query, **kwargs)
+            if not self._is_error(result):
+                _SEARCH_CACHE.set(key, result, expire=_SEARCH_TTL_SECONDS)
+        return result
+
+    async def _arun(self, query: str, **kwargs):
+        key = hashlib.sha256(query.lower().strip().encode()).hexdigest()
+        result = _SEARCH_CACHE.get(key)
+        if result is None:
+            result = await super()._arun(query, **kwargs)
+            if not self._is_error(result):
+                _SEARCH_CACHE.set(key, result, expire=_SEARCH_TTL_SECONDS)
+        return result
+
 @tool
 def get_weather(location: str) -> str:
     """
@@ -203,7 +252,7 @@ def search_tool():
         results = search_tool_instance.invoke({"query": query})
         # Results are then formatted and added to conversation context
     """
-    return TavilySearchResults(
+    return CachedTavilySearch(
         max_results=3,
         description="Use this tool to search for current events, recent developments, real-time information, or facts that might change over time."
     )